@@ -6,146 +6,112 @@ Handles chord detection from audio files using chromagram analysis and template
 
 import librosa
 import numpy as np
+import soundfile as sf
+import soxr
 from scipy.signal import find_peaks
+from scipy.ndimage import uniform_filter1d
 from collections import Counter
 import sounddevice as sd
 import threading
 import time
+from chord_templates import NAMES, MATRIX
+
+# Stack of templates centered and scaled to unit norm per row, so Pearson
+# correlation against every frame is one matmul
+_CHORD_NAMES = np.array(NAMES)
+_TEMPLATES_NORM = MATRIX - MATRIX.mean(axis=1, keepdims=True)
+_TEMPLATES_NORM /= np.linalg.norm(_TEMPLATES_NORM, axis=1, keepdims=True)
+_TEMPLATES_NORM.flags.writeable = False
 
 class ChordDetector:
     def __init__(self):
-        # Define chord templates based on chromagram patterns
-        self.chord_templates = {
-            'C': [1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0],      # C major
-            'C#': [0, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0],     # C# major
-            'D': [0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0],      # D major
-            'D#': [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 0],     # D# major
-            'E': [0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1],      # E major
-            'F': [1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0],      # F major
-            'F#': [0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0],     # F# major
-            'G': [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1],      # G major
-            'G#': [1, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0],     # G# major
-            'A': [0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0],      # A major
-            'A#': [0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 0],     # A# major
-            'B': [0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1],      # B major
-            
-            # Minor chords
-            'Cm': [1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0],     # C minor
-            'C#m': [0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0],    # C# minor
-            'Dm': [0, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 0],     # D minor
-            'D#m': [0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0],    # D# minor
-            'Em': [0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1],     # E minor
-            'Fm': [1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0],     # F minor
-            'F#m': [0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0],    # F# minor
-            'Gm': [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0],     # G minor
-            'G#m': [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1],    # G# minor
-            'Am': [1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0],     # A minor
-            'A#m': [0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0],    # A# minor
-            'Bm': [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1],     # B minor
-        }
-        
-        # Convert templates to numpy arrays for easier computation
-        for chord in self.chord_templates:
-            self.chord_templates[chord] = np.array(self.chord_templates[chord])
+        # Share the module-level template matrix instead of building a copy per instance
+        self._chord_names = _CHORD_NAMES
+        self.T_norm = _TEMPLATES_NORM
     
-    def load_audio(self, file_path):
+    def load_audio(self, file_path, sr=11025):
         """Load MP3 file and return audio time series and sample rate."""
         try:
             print(f"Loading audio file: {file_path}")
-            y, sr = librosa.load(file_path, sr=22050)
+            # 11.025 kHz keeps every pitch that matters for chroma and halves STFT work
+            try:
+                # Decode and resample in ~30 second blocks, so only one block of
+                # full-rate multichannel audio is ever held in memory
+                with sf.SoundFile(file_path) as f:
+                    resampler = soxr.ResampleStream(f.samplerate, sr, 1, dtype='float32')
+                    chunks = []
+                    for block in f.blocks(blocksize=30 * f.samplerate, dtype='float32', always_2d=True):
+                        chunks.append(resampler.resample_chunk(block.mean(axis=1)))
+                    chunks.append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+                y = np.concatenate(chunks)
+            except RuntimeError:
+                # Formats libsndfile can't decode (e.g. M4A) go through audioread
+                y, sr = librosa.load(file_path, sr=sr)
             print(f"Audio loaded successfully. Duration: {len(y)/sr:.2f} seconds")
             return y, sr
         except Exception as e:
             print(f"Error loading audio file: {e}")
             return None, None
     
-    def extract_chromagram(self, y, sr, hop_length=512):
+    def extract_chromagram(self, y, sr, hop_length=256, n_fft=1024):
         """Extract chromagram features from audio."""
         print("Extracting chromagram features...")
-        # Compute chromagram
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr, hop_length=hop_length)
+        # Compute chromagram (at 11.025 kHz, same frame length and frequency
+        # resolution as n_fft=2048 / hop_length=512 at 22.05 kHz)
+        chroma = librosa.feature.chroma_stft(y=y, sr=sr, n_fft=n_fft, hop_length=hop_length)
         return chroma
     
-    def detect_chords_from_chroma(self, chroma):
-        """Detect chords from chromagram using template matching."""
+    def detect_chords_from_chroma(self, chroma, window_size=5):
+        """Detect chords from chromagram using template matching with temporal smoothing."""
         print("Detecting chords from chromagram...")
         
-        # Number of time frames
-        n_frames = chroma.shape[1]
-        detected_chords = []
+        # Center every frame and scale it to unit norm in one pass
+        C = chroma.astype(np.float32)
+        C -= C.mean(axis=0, keepdims=True)
+        norms = np.linalg.norm(C, axis=0, keepdims=True)
+        norms[norms == 0] = 1  # Silent/flat frames end up with zero correlation
+        C /= norms
         
-        # Analyze each time frame
-        for frame_idx in range(n_frames):
-            frame_chroma = chroma[:, frame_idx]
-            
-            # Normalize the chroma vector
-            if np.sum(frame_chroma) > 0:
-                frame_chroma = frame_chroma / np.sum(frame_chroma)
-            
-            # Find best matching chord template
-            best_chord = None
-            best_score = -1
-            
-            for chord_name, template in self.chord_templates.items():
-                # Compute correlation between frame and template
-                score = np.corrcoef(frame_chroma, template)[0, 1]
-                if not np.isnan(score) and score > best_score:
-                    best_score = score
-                    best_chord = chord_name
-            
-            detected_chords.append(best_chord if best_score > 0.5 else 'N/A')
+        # Pearson correlation of every template against every frame:
+        # (a - mean(a)) . (b - mean(b)) / (|a - mean(a)| * |b - mean(b)|)
+        scores = self.T_norm @ C
         
-        return detected_chords
-    
-    def smooth_chord_progression(self, chords, window_size=5):
-        """Smooth chord progression to reduce noise."""
-        smoothed_chords = []
+        # Smooth the scores over time with a moving average to reduce noise
+        scores = uniform_filter1d(scores, size=window_size, axis=1, mode='nearest')
         
-        for i in range(len(chords)):
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(chords), i + window_size // 2 + 1)
-            
-            window_chords = chords[start_idx:end_idx]
-            # Find most common chord in window
-            chord_counts = Counter([c for c in window_chords if c != 'N/A'])
-            
-            if chord_counts:
-                most_common_chord = chord_counts.most_common(1)[0][0]
-                smoothed_chords.append(most_common_chord)
-            else:
-                smoothed_chords.append('N/A')
+        best = scores.argmax(axis=0)
+        best_score = scores.max(axis=0)
+        detected_chords = np.where(best_score > 0.5, self._chord_names[best], 'N/A')
         
-        return smoothed_chords
+        return detected_chords.tolist()
     
-    def get_chord_progression(self, chords, hop_length=512, sr=22050):
+    def get_chord_progression(self, chords, hop_length=256, sr=11025):
         """Extract unique chord progression with timing information."""
         print("Extracting chord progression...")
         
         progression = []
-        current_chord = None
-        start_time = 0
+        if not chords:
+            return progression
         
         frame_duration = hop_length / sr  # Duration of each frame in seconds
         
-        for i, chord in enumerate(chords):
-            if chord != current_chord and chord != 'N/A':
-                if current_chord is not None:
-                    end_time = i * frame_duration
-                    progression.append({
-                        'chord': current_chord,
-                        'start_time': start_time,
-                        'end_time': end_time,
-                        'duration': end_time - start_time
-                    })
-                
-                current_chord = chord
-                start_time = i * frame_duration
-        
-        # Add the last chord
-        if current_chord is not None:
-            end_time = len(chords) * frame_duration
+        # N/A frames never start a new chord, so run-length encode only the
+        # frames with a detected chord; a chord lasts until the next one starts
+        arr = np.asarray(chords)
+        frames = np.flatnonzero(arr != 'N/A')
+        if len(frames) == 0:
+            return progression
+        
+        labels = arr[frames]
+        changes = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+        starts = frames[np.concatenate(([0], changes))]
+        ends = np.append(starts[1:], len(chords))
+        
+        for chord, start, end in zip(arr[starts].tolist(), starts.tolist(), ends.tolist()):
+            start_time = start * frame_duration
+            end_time = end * frame_duration
             progression.append({
-                'chord': current_chord,
+                'chord': chord,
                 'start_time': start_time,
                 'end_time': end_time,
                 'duration': end_time - start_time
@@ -163,17 +129,14 @@ class ChordDetector:
         # Extract chromagram
         chroma = self.extract_chromagram(y, sr)
         
-        # Detect chords
-        raw_chords = self.detect_chords_from_chroma(chroma)
-        
-        # Smooth chord progression
-        smoothed_chords = self.smooth_chord_progression(raw_chords)
+        # Detect chords (smoothed over time)
+        chords = self.detect_chords_from_chroma(chroma)
         
         # Get final chord progression
-        progression = self.get_chord_progression(smoothed_chords)
+        progression = self.get_chord_progression(chords, sr=sr)
         
         # Get chord statistics
-        chord_counts = Counter([c for c in smoothed_chords if c != 'N/A'])
+        chord_counts = Counter([c for c in chords if c != 'N/A'])
         
         return {
             'progression': progression,
@@ -238,32 +201,30 @@ class ChordDetector:
         import os
         os.makedirs("live_recordings", exist_ok=True)
         temp_filename = f"live_recordings/live_recording_{int(time.time())}.wav"
-        try:
-            import soundfile as sf
-            sf.write(temp_filename, y, sr)
-            print(f"📁 Recording saved as: {temp_filename}")
-        except ImportError:
-            print("Note: soundfile not available, recording not saved to file")
+        sf.write(temp_filename, y, sr)
+        print(f"📁 Recording saved as: {temp_filename}")
+        
+        # Analyze at the same sample rate as audio files
+        total_duration = len(y) / sr
+        y = librosa.resample(y, orig_sr=sr, target_sr=11025)
+        sr = 11025
         
         # Extract chromagram
         chroma = self.extract_chromagram(y, sr)
         
-        # Detect chords
-        raw_chords = self.detect_chords_from_chroma(chroma)
-        
-        # Smooth chord progression
-        smoothed_chords = self.smooth_chord_progression(raw_chords)
+        # Detect chords (smoothed over time)
+        chords = self.detect_chords_from_chroma(chroma)
         
         # Get final chord progression
-        progression = self.get_chord_progression(smoothed_chords)
+        progression = self.get_chord_progression(chords, sr=sr)
         
         # Get chord statistics
-        chord_counts = Counter([c for c in smoothed_chords if c != 'N/A'])
+        chord_counts = Counter([c for c in chords if c != 'N/A'])
         
         return {
             'progression': progression,
             'chord_counts': chord_counts,
-            'total_duration': len(y) / sr,
+            'total_duration': total_duration,
             'source': 'live_recording',
             'filename': temp_filename if 'temp_filename' in locals() else 'live_recording'
         }
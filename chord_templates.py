@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Chord Templates
+Chromagram templates for the 24 major and minor triads, built once at import and shared by every ChordDetector.
+"""
+
+import numpy as np
+
+# Define chord templates based on chromagram patterns
+_TEMPLATES = {
+    'C': [1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0],      # C major
+    'C#': [0, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0],     # C# major
+    'D': [0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0],      # D major
+    'D#': [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 0],     # D# major
+    'E': [0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1],      # E major
+    'F': [1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0],      # F major
+    'F#': [0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0],     # F# major
+    'G': [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1],      # G major
+    'G#': [1, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0],     # G# major
+    'A': [0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0],      # A major
+    'A#': [0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 0],     # A# major
+    'B': [0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1],      # B major
+    
+    # Minor chords
+    'Cm': [1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0],     # C minor
+    'C#m': [0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0],    # C# minor
+    'Dm': [0, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 0],     # D minor
+    'D#m': [0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0],    # D# minor
+    'Em': [0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1],     # E minor
+    'Fm': [1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0],     # F minor
+    'F#m': [0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0],    # F# minor
+    'Gm': [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0],     # G minor
+    'G#m': [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1],    # G# minor
+    'Am': [1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0],     # A minor
+    'A#m': [0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0],    # A# minor
+    'Bm': [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1],     # B minor
+}
+
+# Chord names, in the same order as the rows of MATRIX
+NAMES = tuple(_TEMPLATES)
+
+# (24, 12) read-only template matrix, one pitch-class profile per row
+MATRIX = np.ascontiguousarray(list(_TEMPLATES.values()), dtype=np.float32)
+MATRIX.flags.writeable = False
@@ -7,12 +7,29 @@ Reads chord-output.txt and plays back the detected chords using synthesized guit
 import re
 import time
 import sys
+import threading
+import numpy as np
 from synthesizer import Player, Synthesizer, Waveform
+from utils.save_to_output import format_progression_table
+
+# Chord progression section of a chord-output.txt file
+_PROG_RE = re.compile(r'📊 CHORD PROGRESSION:\s*-+\s*(.*?)(?=\n\||\n🎵|\Z)', re.DOTALL)
+
+# A single progression line: "N. Chord | MM:SS.mmm - MM:SS.mmm | Duration: MM:SS.mmm"
+_CHORD_RE = re.compile(
+    r'\s*\d+\.\s+(?P<chord>\w+m?)\s+\|'
+    r'\s+(?P<sm>\d{2}):(?P<ss>\d{2})\.(?P<sms>\d{3})\s+-'
+    r'\s+(?P<em>\d{2}):(?P<es>\d{2})\.(?P<ems>\d{3})\s+\|'
+    r'\s+Duration:\s+(?P<dm>\d{2}):(?P<ds>\d{2})\.(?P<dms>\d{3})'
+)
 
 class GuitarPlayback:
     def __init__(self):
+        # Sample rate shared by the synthesizer, the output stream and the render buffer
+        self.sample_rate = 44100
+        
         # Initialize synthesizer with guitar-like settings
-        self.player = Player()
+        self.player = Player(rate=self.sample_rate)
         self.player.open_stream()
         
         # Use sawtooth wave for a more guitar-like sound
@@ -22,7 +39,8 @@ class GuitarPlayback:
             use_osc2=True,
             osc2_waveform=Waveform.square,
             osc2_volume=0.3,
-            osc2_freq_transpose=12  # One octave higher
+            osc2_freq_transpose=12,  # One octave higher
+            rate=self.sample_rate
         )
         
         # Define chord note mappings (guitar voicings in 4th octave)
@@ -55,17 +73,20 @@ class GuitarPlayback:
             'A#m': ['A#4', 'C#5', 'F5'],
             'Bm': ['B4', 'D5', 'F#5'],
         }
+        
+        # Synthesized waveforms keyed by (chord name, duration in ms)
+        self._wave_cache = {}
     
     def parse_chord_output(self, file_path):
         """Parse chord-output.txt file to extract chord progression with timing."""
         chords = []
         
         try:
-            with open(file_path, 'r') as f:
+            with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             # Find chord progression section
-            progression_match = re.search(r'📊 CHORD PROGRESSION:\s*-+\s*(.*?)(?=\n\||\n🎵|\Z)', content, re.DOTALL)
+            progression_match = _PROG_RE.search(content)
             if not progression_match:
                 print("❌ Could not find chord progression in file")
                 return []
@@ -73,16 +94,14 @@ class GuitarPlayback:
             progression_text = progression_match.group(1)
             
             # Parse each chord line
-            chord_pattern = r'\s*\d+\.\s+(\w+(?:m)?)\s+\|\s+(\d{2}:\d{2}\.\d{3})\s+-\s+(\d{2}:\d{2}\.\d{3})\s+\|\s+Duration:\s+(\d{2}:\d{2}\.\d{3})'
-            
-            for match in re.finditer(chord_pattern, progression_text):
-                chord_name = match.group(1)
-                start_time = self.parse_time(match.group(2))
-                end_time = self.parse_time(match.group(3))
-                duration = self.parse_time(match.group(4))
+            for m in _CHORD_RE.finditer(progression_text):
+                # Times are MM:SS.mmm, captured as minutes/seconds/milliseconds
+                start_time = int(m['sm']) * 60 + int(m['ss']) + int(m['sms']) / 1000.0
+                end_time = int(m['em']) * 60 + int(m['es']) + int(m['ems']) / 1000.0
+                duration = int(m['dm']) * 60 + int(m['ds']) + int(m['dms']) / 1000.0
                 
                 chords.append({
-                    'chord': chord_name,
+                    'chord': m['chord'],
                     'start_time': start_time,
                     'end_time': end_time,
                     'duration': duration
@@ -97,29 +116,50 @@ class GuitarPlayback:
             print(f"❌ Error parsing file: {e}")
             return []
     
-    def parse_time(self, time_str):
-        """Convert time string (MM:SS.mmm) to seconds."""
-        parts = time_str.split(':')
-        minutes = int(parts[0])
-        seconds_parts = parts[1].split('.')
-        seconds = int(seconds_parts[0])
-        milliseconds = int(seconds_parts[1])
-        
-        return minutes * 60 + seconds + milliseconds / 1000.0
+    def get_chord_wave(self, chord_name, duration):
+        """Return the synthesized waveform for a chord, generating it only once per duration."""
+        # Durations in chord-output.txt have millisecond precision
+        key = (chord_name, round(duration * 1000))
+        wave = self._wave_cache.get(key)
+        if wave is None:
+            wave = self.synthesizer.generate_chord(self.chord_notes[chord_name], key[1] / 1000.0)
+            self._wave_cache[key] = wave
+        return wave
     
-    def play_chord(self, chord_name, duration):
-        """Play a single chord for the specified duration."""
-        if chord_name not in self.chord_notes:
-            print(f"⚠️  Unknown chord: {chord_name}, skipping...")
-            time.sleep(duration)
-            return
-        
-        notes = self.chord_notes[chord_name]
-        print(f"🎸 Playing {chord_name} for {duration:.3f}s")
+    def render_progression(self, chords):
+        """Render the entire chord progression into one contiguous waveform."""
+        sr = self.sample_rate
+        total_samples = int(round(max(c['end_time'] for c in chords) * sr))
+        out = np.zeros(total_samples, dtype=np.float32)
         
-        # Generate and play the chord
-        wave = self.synthesizer.generate_chord(notes, duration)
-        self.player.play_wave(wave)
+        for chord_info in chords:
+            chord_name = chord_info['chord']
+            if chord_name not in self.chord_notes:
+                # Leave silence where the chord would have played
+                print(f"⚠️  Unknown chord: {chord_name}, skipping...")
+                continue
+            
+            # Place the chord at its start time
+            start = int(round(chord_info['start_time'] * sr))
+            wave = self.get_chord_wave(chord_name, chord_info['duration'])
+            n = min(len(wave), total_samples - start)
+            if n > 0:
+                out[start:start + n] += wave[:n]
+        
+        return out
+    
+    def _follow_progression(self, chords, anchor, stop):
+        """Print each chord as it starts, timed from anchor, until stop is set."""
+        for chord_info in chords:
+            # Unknown chords were already reported as skipped while rendering
+            if chord_info['chord'] not in self.chord_notes:
+                continue
+            
+            # wait() returns True as soon as playback is stopped
+            deadline = anchor + chord_info['start_time']
+            if stop.wait(max(0.0, deadline - time.perf_counter())):
+                return
+            print(f"🎸 Playing {chord_info['chord']} for {chord_info['duration']:.3f}s")
     
     def play_progression(self, chords):
         """Play the entire chord progression with proper timing."""
@@ -130,22 +170,27 @@ class GuitarPlayback:
         print(f"\n🎵 Playing chord progression ({len(chords)} chords)...")
         print("=" * 50)
         
-        start_time = time.time()
+        # Synthesize everything up front so playback is one uninterrupted stream
+        wave = self.render_progression(chords)
         
-        for i, chord_info in enumerate(chords):
-            chord_name = chord_info['chord']
-            duration = chord_info['duration']
-            
-            # Calculate when this chord should start
-            target_time = start_time + chord_info['start_time']
-            current_time = time.time()
-            
-            # Wait if we're ahead of schedule
-            if current_time < target_time:
-                time.sleep(target_time - current_time)
-            
-            # Play the chord
-            self.play_chord(chord_name, duration)
+        # Write on this thread in short blocks, so Ctrl+C stops the audio between
+        # blocks and write errors surface here; a helper thread follows along
+        # against monotonic deadlines to report the current chord
+        block_size = self.sample_rate // 10
+        stop = threading.Event()
+        anchor = time.perf_counter()
+        follower = threading.Thread(target=self._follow_progression, args=(chords, anchor, stop), daemon=True)
+        follower.start()
+        
+        try:
+            for start in range(0, len(wave), block_size):
+                self.player.play_wave(wave[start:start + block_size])
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            # Never leave the helper running once the stream may be closed
+            follower.join()
         
         print("=" * 50)
         print("✅ Playback complete!")
@@ -184,10 +229,7 @@ def main():
         print(f"✅ Found {len(chords)} chords")
         
         # Display chord progression
-        print("\n📊 Chord Progression:")
-        print("-" * 30)
-        for i, chord_info in enumerate(chords, 1):
-            print(f"{i:2d}. {chord_info['chord']:4s} | {chord_info['duration']:.3f}s")
+        sys.stdout.write(format_progression_table(chords))
         
         # Ask user if they want to play
         print("\n🎵 Ready to play! Press Enter to start (or Ctrl+C to cancel)")
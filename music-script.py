@@ -8,8 +8,6 @@ Supports both file analysis and live audio recording.
 import argparse
 import sys
 import os
-from ChordDetector import ChordDetector
-from utils.save_to_output import format_time, create_chord_timeline, save_results_to_file, print_analysis_results
 
 def get_user_choice():
     """Get user's choice for input mode."""
@@ -55,26 +53,31 @@ def interactive_mode():
     """Run in interactive mode with user choice."""
     choice = get_user_choice()
     
-    # Create chord detector
-    detector = ChordDetector()
-    
     try:
         if choice == 1:
             # File analysis mode
             file_path = get_file_path()
             print(f"\n🎵 Analyzing file: {os.path.basename(file_path)}")
+            
+            # Import lazily: librosa/numba are slow to load and playback doesn't need them
+            from ChordDetector import ChordDetector
+            detector = ChordDetector()
             results = detector.analyze_mp3(file_path)
             source_name = file_path
             
         elif choice == 2:
             # Live recording mode
             print(f"\n🎤 Live recording mode")
+            
+            from ChordDetector import ChordDetector
+            detector = ChordDetector()
             results = detector.analyze_live_audio()
             source_name = results.get('filename', 'live_recording') if results else 'live_recording'
             
         else:
             # Playback mode
             from guitar_playback import GuitarPlayback
+            from utils.save_to_output import format_progression_table
             
             output_file = input("Enter path to chord output file (default: chord-output.txt): ").strip()
             if not output_file:
@@ -95,10 +98,7 @@ def interactive_mode():
                 print(f"✅ Found {len(chords)} chords")
                 
                 # Display chord progression
-                print("\n📊 Chord Progression:")
-                print("-" * 30)
-                for i, chord_info in enumerate(chords, 1):
-                    print(f"{i:2d}. {chord_info['chord']:4s} | {chord_info['duration']:.3f}s")
+                sys.stdout.write(format_progression_table(chords))
                 
                 # Ask user if they want to play
                 print("\n🎵 Ready to play! Press Enter to start (or Ctrl+C to cancel)")
@@ -117,11 +117,13 @@ def interactive_mode():
             return
         
         if results:
+            from utils.save_to_output import print_analysis_results
             print_analysis_results(results, source_name)
             
             # Ask if user wants to save results
             save_choice = input("\nSave results to file? (y/n): ").strip().lower()
             if save_choice in ['y', 'yes']:
+                from utils.save_to_output import save_results_to_file
                 output_file = input("Output filename (press Enter for 'chord-output.txt'): ").strip()
                 if not output_file:
                     output_file = 'chord-output.txt'
@@ -135,20 +137,99 @@ def interactive_mode():
         traceback.print_exc()
         sys.exit(1)
 
+def positive_int(value):
+    """argparse type for a count that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def per_file_output_name(file_path):
+    """Derive an output filename next to the audio file, so batch runs don't overwrite each other."""
+    # Keep the extension so song.mp3 and song.wav get different reports
+    return file_path + '-chord-output.txt'
+
+def _analyze_one(file_path):
+    """Analyze a single file in a worker process (module-level so it can be pickled)."""
+    from ChordDetector import ChordDetector
+    detector = ChordDetector()
+    return file_path, detector.analyze_mp3(file_path)
+
+def batch_mode(args):
+    """Analyze several audio files in parallel, one worker process per file."""
+    from concurrent.futures import ProcessPoolExecutor
+    from utils.save_to_output import save_results_to_file, print_analysis_results
+    
+    for file_path in args.file_path:
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            sys.exit(1)
+        
+        if not file_path.lower().endswith(('.mp3', '.wav', '.flac', '.m4a')):
+            print(f"Warning: '{file_path}' doesn't appear to be an audio file. Proceeding anyway...")
+    
+    if args.output is not None:
+        print("Warning: --output is ignored with several files; each report is saved as <file>-chord-output.txt")
+    
+    # The same file listed twice (even via different paths) would share a report
+    seen = {}
+    for file_path in args.file_path:
+        key = os.path.normcase(os.path.abspath(per_file_output_name(file_path)))
+        if key in seen:
+            print(f"Error: '{seen[key]}' and '{file_path}' are the same file.")
+            sys.exit(1)
+        seen[key] = file_path
+    
+    print(f"🎵 Analyzing {len(args.file_path)} files with {args.jobs} parallel jobs")
+    
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [executor.submit(_analyze_one, file_path) for file_path in args.file_path]
+        
+        # Report in input order; a failure only affects its own file
+        for file_path, future in zip(args.file_path, futures):
+            try:
+                _, results = future.result()
+            except Exception as e:
+                print(f"Error during analysis of '{file_path}': {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exception(type(e), e, e.__traceback__)
+                failed.append(file_path)
+                continue
+            
+            if results:
+                print_analysis_results(results, file_path)
+                
+                # Save results to file if requested
+                if args.save:
+                    save_results_to_file(results, file_path, per_file_output_name(file_path))
+            else:
+                print(f"No results to display for {file_path}.")
+    
+    if failed:
+        print(f"❌ {len(failed)} of {len(args.file_path)} files failed: {', '.join(failed)}")
+        sys.exit(1)
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze audio for chord progressions')
-    parser.add_argument('file_path', nargs='?', help='Path to the audio file to analyze (optional)')
+    parser.add_argument('file_path', nargs='*', help='Path(s) to the audio file(s) to analyze (optional)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
-    parser.add_argument('--output', '-o', default='chord-output.txt', help='Output file for results (default: chord-output.txt)')
+    parser.add_argument('--output', '-o', help='Output file for results (default: chord-output.txt; with several files, <file>-chord-output.txt next to each)')
     parser.add_argument('--save', '-s', action='store_true', help='Save results to output file')
     parser.add_argument('--live', '-l', action='store_true', help='Record live audio from microphone')
     parser.add_argument('--playback', '-p', help='Play back chords from output file using guitar sounds')
+    parser.add_argument('--jobs', '-j', type=positive_int, default=os.cpu_count() or 1, help='Number of files to analyze in parallel (default: number of CPUs)')
     
     args = parser.parse_args()
     
     # Handle playback mode
     if args.playback:
         from guitar_playback import GuitarPlayback
+        from utils.save_to_output import format_progression_table
         
         print("🎸 Guitar Chord Playback System")
         print("=" * 40)
@@ -165,10 +246,7 @@ def main():
             print(f"✅ Found {len(chords)} chords")
             
             # Display chord progression
-            print("\n📊 Chord Progression:")
-            print("-" * 30)
-            for i, chord_info in enumerate(chords, 1):
-                print(f"{i:2d}. {chord_info['chord']:4s} | {chord_info['duration']:.3f}s")
+            sys.stdout.write(format_progression_table(chords))
             
             # Ask user if they want to play
             print("\n🎵 Ready to play! Press Enter to start (or Ctrl+C to cancel)")
@@ -191,33 +269,44 @@ def main():
         interactive_mode()
         return
     
-    # Create chord detector
-    detector = ChordDetector()
+    # Several files: analyze them in parallel
+    if len(args.file_path) > 1 and not args.live:
+        batch_mode(args)
+        return
     
     try:
         if args.live:
             # Live recording mode
             print("🎤 Live recording mode")
+            
+            # Import lazily: librosa/numba are slow to load and playback doesn't need them
+            from ChordDetector import ChordDetector
+            detector = ChordDetector()
             results = detector.analyze_live_audio()
             source_name = results.get('filename', 'live_recording') if results else 'live_recording'
         else:
             # File analysis mode
-            if not os.path.exists(args.file_path):
-                print(f"Error: File '{args.file_path}' not found.")
+            file_path = args.file_path[0]
+            if not os.path.exists(file_path):
+                print(f"Error: File '{file_path}' not found.")
                 sys.exit(1)
             
-            if not args.file_path.lower().endswith(('.mp3', '.wav', '.flac', '.m4a')):
+            if not file_path.lower().endswith(('.mp3', '.wav', '.flac', '.m4a')):
                 print("Warning: File doesn't appear to be an audio file. Proceeding anyway...")
             
-            results = detector.analyze_mp3(args.file_path)
-            source_name = args.file_path
+            from ChordDetector import ChordDetector
+            detector = ChordDetector()
+            results = detector.analyze_mp3(file_path)
+            source_name = file_path
         
         if results:
+            from utils.save_to_output import print_analysis_results
             print_analysis_results(results, source_name)
             
             # Save results to file if requested
             if args.save:
-                save_results_to_file(results, source_name, args.output)
+                from utils.save_to_output import save_results_to_file
+                save_results_to_file(results, source_name, args.output or 'chord-output.txt')
         else:
             print("No results to display.")
         
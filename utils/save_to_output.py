@@ -5,15 +5,34 @@ Contains functions for formatting and saving chord analysis results to files.
 """
 
 import os
+import sys
+import numpy as np
 
 def format_time(seconds):
     """Format time in MM:SS.mmm format with milliseconds."""
-    minutes = int(seconds // 60)
-    remaining_seconds = seconds % 60
-    secs = int(remaining_seconds)
-    milliseconds = int((remaining_seconds - secs) * 1000)
+    # Round to whole milliseconds once, then split with integer arithmetic
+    milliseconds = int(round(seconds * 1000))
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
     return f"{minutes:02d}:{secs:02d}.{milliseconds:03d}"
 
+def format_times(seconds):
+    """Format an array of times in MM:SS.mmm format, splitting all values at once with NumPy."""
+    milliseconds = np.rint(np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+    minutes, milliseconds = np.divmod(milliseconds, 60_000)
+    secs, milliseconds = np.divmod(milliseconds, 1000)
+    return [f"{m:02d}:{s:02d}.{ms:03d}" for m, s, ms in zip(minutes.tolist(), secs.tolist(), milliseconds.tolist())]
+
+def format_progression_rows(progression):
+    """Format each chord of a progression as an 'N. Chord | Start - End | Duration' line."""
+    n = len(progression)
+    starts = format_times(np.fromiter((c['start_time'] for c in progression), dtype=np.float64, count=n))
+    ends = format_times(np.fromiter((c['end_time'] for c in progression), dtype=np.float64, count=n))
+    durations = format_times(np.fromiter((c['duration'] for c in progression), dtype=np.float64, count=n))
+    
+    return [f"{i:2d}. {c['chord']:4s} | {start} - {end} | Duration: {duration}\n"
+            for i, (c, start, end, duration) in enumerate(zip(progression, starts, ends, durations), 1)]
+
 def create_chord_timeline(results):
     """Create a visual timeline representation of chord progression with proportional durations."""
     if not results or not results['progression']:
@@ -25,9 +44,10 @@ def create_chord_timeline(results):
     min_dashes = 2  # Minimum dashes per chord for readability
     
     # Calculate dash counts proportional to duration
-    timeline_line = "|"
+    segments = []
     chord_labels = []
     label_positions = []
+    width = 1  # Leading "|"
     
     for chord_info in results['progression']:
         # Calculate proportional width (minimum 2 dashes)
@@ -35,74 +55,90 @@ def create_chord_timeline(results):
         dash_count = max(min_dashes, int(proportion * max_width))
         
         # Create dashes for this chord
-        duration_dashes = "-" * dash_count
-        timeline_line += duration_dashes + "|"
+        segments.append("-" * dash_count + "|")
+        width += dash_count + 1
         
         # Store chord and calculate center position for label
         chord_labels.append(chord_info['chord'])
-        label_positions.append(len(timeline_line) - dash_count // 2 - 1)
+        label_positions.append(width - dash_count // 2 - 1)
+    
+    # Join all segments at once instead of growing the string chord by chord
+    timeline_line = "|" + "".join(segments)
     
     # Create the chord labels line with proper spacing
-    chord_line = " " * len(timeline_line)
-    chord_line = list(chord_line)  # Convert to list for easier manipulation
+    chord_line = [" "] * width
     
-    for i, (chord, pos) in enumerate(zip(chord_labels, label_positions)):
+    for chord, pos in zip(chord_labels, label_positions):
         # Center the chord name at the calculated position
         start_pos = max(0, pos - len(chord) // 2)
-        end_pos = min(len(chord_line), start_pos + len(chord))
+        end_pos = min(width, start_pos + len(chord))
         
         # Place chord name, ensuring it doesn't go out of bounds
-        for j, char in enumerate(chord):
-            if start_pos + j < len(chord_line):
-                chord_line[start_pos + j] = char
+        chord_line[start_pos:end_pos] = chord[:end_pos - start_pos]
     
     chord_line = "".join(chord_line).rstrip()
     
     return f"{timeline_line}\n{chord_line}"
 
+def format_chord_frequency_rows(chord_counts):
+    """Format each chord's share of frames as a 'Chord: pct% (count frames)' line, most common first."""
+    items = chord_counts.most_common()
+    labels = [chord for chord, _ in items]
+    counts = np.fromiter((count for _, count in items), dtype=np.int64, count=len(items))
+    
+    # Compute every percentage in one vectorized pass
+    percentages = counts / counts.sum() * 100
+    
+    return [f"{chord:4s}: {pct:5.1f}% ({count} frames)\n"
+            for chord, pct, count in zip(labels, percentages.tolist(), counts.tolist())]
+
+def format_progression_table(chords):
+    """Format a parsed chord progression as the table shown before playback."""
+    lines = ["\n📊 Chord Progression:", "-" * 30]
+    lines.extend(f"{i:2d}. {c['chord']:4s} | {c['duration']:.3f}s" for i, c in enumerate(chords, 1))
+    return "\n".join(lines) + "\n"
+
 def save_results_to_file(results, file_path, output_file="chord-output.txt"):
     """Save analysis results to a text file."""
     try:
         # Create the file if it doesn't exist, or overwrite if it does
-        if not os.path.exists(output_file):
+        if not os.path.lexists(output_file):
             print(f"Creating new file: {output_file}")
         else:
             print(f"Overwriting existing file: {output_file}")
+        
+        # Build the whole report first so the file gets a single write
+        parts = []
+        parts.append("="*60 + "\n")
+        parts.append(f"CHORD ANALYSIS RESULTS FOR: {os.path.basename(file_path)}\n")
+        parts.append("="*60 + "\n\n")
+        
+        parts.append(f"Total Duration: {format_time(results['total_duration'])}\n\n")
+        
+        parts.append("📊 CHORD PROGRESSION:\n")
+        parts.append("-" * 50 + "\n")
+        
+        if results['progression']:
+            parts.extend(format_progression_rows(results['progression']))
             
-        with open(output_file, 'w') as f:
-            f.write("="*60 + "\n")
-            f.write(f"CHORD ANALYSIS RESULTS FOR: {os.path.basename(file_path)}\n")
-            f.write("="*60 + "\n\n")
-            
-            f.write(f"Total Duration: {format_time(results['total_duration'])}\n\n")
-            
-            f.write("📊 CHORD PROGRESSION:\n")
-            f.write("-" * 50 + "\n")
-            
-            if results['progression']:
-                for i, chord_info in enumerate(results['progression'], 1):
-                    start_time = format_time(chord_info['start_time'])
-                    end_time = format_time(chord_info['end_time'])
-                    duration = format_time(chord_info['duration'])
-                    
-                    f.write(f"{i:2d}. {chord_info['chord']:4s} | {start_time} - {end_time} | Duration: {duration}\n")
-                
-                f.write("\n" + create_chord_timeline(results) + "\n\n")
-            else:
-                f.write("No clear chord progression detected.\n\n")
-            
-            f.write("🎵 CHORD FREQUENCY:\n")
-            f.write("-" * 30 + "\n")
-            
-            if results['chord_counts']:
-                total_frames = sum(results['chord_counts'].values())
-                for chord, count in results['chord_counts'].most_common():
-                    percentage = (count / total_frames) * 100
-                    f.write(f"{chord:4s}: {percentage:5.1f}% ({count} frames)\n")
-            else:
-                f.write("No chords detected.\n")
-            
-            f.write("\n" + "="*60 + "\n")
+            parts.append("\n" + create_chord_timeline(results) + "\n\n")
+        else:
+            parts.append("No clear chord progression detected.\n\n")
+        
+        parts.append("🎵 CHORD FREQUENCY:\n")
+        parts.append("-" * 30 + "\n")
+        
+        if results['chord_counts']:
+            parts.extend(format_chord_frequency_rows(results['chord_counts']))
+        else:
+            parts.append("No chords detected.\n")
+        
+        parts.append("\n" + "="*60 + "\n")
+        
+        # Encode once and write the bytes in one call, bypassing the text-mode encoder
+        data = "".join(parts).encode('utf-8')
+        with open(output_file, 'wb') as f:
+            f.write(data)
         
         print(f"Results saved to {output_file}")
         
@@ -115,34 +151,30 @@ def print_analysis_results(results, file_path):
         print("No results to display.")
         return
     
-    print("\n" + "="*60)
-    print(f"CHORD ANALYSIS RESULTS FOR: {os.path.basename(file_path)}")
-    print("="*60)
+    # Build the whole report first so stdout gets a single write
+    parts = []
+    parts.append("\n" + "="*60 + "\n")
+    parts.append(f"CHORD ANALYSIS RESULTS FOR: {os.path.basename(file_path)}\n")
+    parts.append("="*60 + "\n")
     
-    print(f"\nTotal Duration: {format_time(results['total_duration'])}")
+    parts.append(f"\nTotal Duration: {format_time(results['total_duration'])}\n")
     
-    print("\n📊 CHORD PROGRESSION:")
-    print("-" * 50)
+    parts.append("\n📊 CHORD PROGRESSION:\n")
+    parts.append("-" * 50 + "\n")
     
     if results['progression']:
-        for i, chord_info in enumerate(results['progression'], 1):
-            start_time = format_time(chord_info['start_time'])
-            end_time = format_time(chord_info['end_time'])
-            duration = format_time(chord_info['duration'])
-            
-            print(f"{i:2d}. {chord_info['chord']:4s} | {start_time} - {end_time} | Duration: {duration}")
+        parts.extend(format_progression_rows(results['progression']))
     else:
-        print("No clear chord progression detected.")
+        parts.append("No clear chord progression detected.\n")
     
-    print("\n🎵 CHORD FREQUENCY:")
-    print("-" * 30)
+    parts.append("\n🎵 CHORD FREQUENCY:\n")
+    parts.append("-" * 30 + "\n")
     
     if results['chord_counts']:
-        total_frames = sum(results['chord_counts'].values())
-        for chord, count in results['chord_counts'].most_common():
-            percentage = (count / total_frames) * 100
-            print(f"{chord:4s}: {percentage:5.1f}% ({count} frames)")
+        parts.extend(format_chord_frequency_rows(results['chord_counts']))
     else:
-        print("No chords detected.")
+        parts.append("No chords detected.\n")
+    
+    parts.append("\n" + "="*60 + "\n")
     
-    print("\n" + "="*60)
+    sys.stdout.write("".join(parts))